@@ -34,7 +34,6 @@ import datetime
 import requests
 
 import pandas as pd
-import geopandas as gpd
 from shapely.geometry import Point
 
 from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
@@ -107,7 +106,7 @@ PROCESS_METADATA = {
         },
         'out_format': {
             'title': 'Return format type',
-            'description': 'The return format type. Possible values are "geojson" or "dataframe". "geojson" is default and preferable.',
+            'description': 'The return format type. Possible values are "geojson", "geojson-nl" (newline-delimited GeoJSON) or "geoparquet" ("geojson-nl" and "geoparquet" are available only for the "water_level" variable). "geojson" is default and preferable.',
             'schema': {
             }
         }, 
@@ -216,9 +215,11 @@ class ARPAVRetrieverProcessor(BaseProcessor):
             ARPAVRetriever = _ARPAV_RETRIEVERS[self.variable]()
 
             # DOC: Set up the ARPAV Retriever
-            outputs = ARPAVRetriever.run(**data)
+            # DOC: Sensors data are only converted to a FeatureCollection, no need for point geometries (only the water_level retriever supports as_geodataframe)
+            run_args = data | { 'as_geodataframe': False } if self.variable == 'water_level' else data
+            outputs = ARPAVRetriever.run(**run_args)
 
-            if type(outputs) is gpd.GeoDataFrame:
+            if isinstance(outputs, pd.DataFrame):
                 outputs = ARPAVRetriever.data_to_feature_collection(outputs)
 
 
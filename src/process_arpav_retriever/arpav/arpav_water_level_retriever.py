@@ -1,9 +1,13 @@
 import os
-import json
 import uuid
 import datetime
+import threading
+import orjson
 import urllib3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
@@ -18,6 +22,26 @@ from ..utils.status_exception import StatusException
 urllib3.disable_warnings()
 
 
+# DOC: Shared read-only constants, returned as-is in every FeatureCollection: callers must not mutate them
+# DOC: info metadata, each ealement is a { '@name': 'name', '@alias': 'alias' } ... not used beacuse the names are self-explanatory
+_FIELD_METADATA = (
+    # DOC: variable metadata
+    {
+        '@name': 'water_level',
+        '@alias': 'water_level',
+        '@unit': 'mm',
+        '@type': 'level'
+    },
+)
+
+_CRS = {
+    "type": "name",
+    "properties": {
+        "name": "urn:ogc:def:crs:OGC:1.3:CRS84"  # REF: https://gist.github.com/sgillies/1233327 lines 256:271
+    }
+}
+
+
 
 class _ARPAVWaterLevelRetriever():
     """
@@ -47,9 +71,35 @@ class _ARPAVWaterLevelRetriever():
         "provincia"
     ]
 
+    # DOC: Pooled session shared by all instances of the same worker process, hourly requests reuse the TLS connections
+    # DOC: the pool is sized for several concurrent executions and blocks when full, so connections are never discarded
+    _fetch_workers = 8
+    _session_pool_size = 4 * _fetch_workers
+    _shared_session = None
+    _shared_session_lock = threading.Lock()
+
+    @classmethod
+    def _get_session(cls):
+        """
+        Return the shared HTTP session, created lazily on first use.
+        """
+
+        with cls._shared_session_lock:
+            if cls._shared_session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=cls._session_pool_size,
+                    pool_block=True,
+                    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+                ))
+                cls._shared_session = session
+        return cls._shared_session
+
     def __init__(self):
 
         self._data_provider_service = "https://api.arpa.veneto.it/REST/v1/meteo_meteogrammi"
+        self._session = self._get_session()
         
         if not os.path.exists(self._tmp_data_folder):
             os.makedirs(self._tmp_data_folder)
@@ -60,19 +110,21 @@ class _ARPAVWaterLevelRetriever():
         Validate the arguments passed to the processor.
         """
 
+        now = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+
         lat_range = kwargs.get('lat_range', None)
         long_range = kwargs.get('long_range', None)
         time_range = kwargs.get('time_range', None)
-        time_start = time_range[0] if type(time_range) in [list, tuple] else time_range
-        time_end = time_range[1] if type(time_range) in [list, tuple] else None
+        time_start = time_range[0] if isinstance(time_range, (list, tuple)) else time_range
+        time_end = time_range[1] if isinstance(time_range, (list, tuple)) else None
         out_format = kwargs.get('out_format', None)
         bucket_destination = kwargs.get('bucket_destination', None)
         out = kwargs.get('out', None)
 
         if lat_range is not None:
-            if type(lat_range) is not list or len(lat_range) != 2:
+            if not isinstance(lat_range, list) or len(lat_range) != 2:
                 raise StatusException(StatusException.INVALID, 'lat_range must be a list of 2 elements')
-            if type(lat_range[0]) not in [int, float] or type(lat_range[1]) not in [int, float]:
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in lat_range):
                 raise StatusException(StatusException.INVALID, 'lat_range elements must be float')
             if lat_range[0] < -90 or lat_range[0] > 90 or lat_range[1] < -90 or lat_range[1] > 90:
                 raise StatusException(StatusException.INVALID, 'lat_range elements must be in the range [-90, 90]')
@@ -80,9 +132,9 @@ class _ARPAVWaterLevelRetriever():
                 raise StatusException(StatusException.INVALID, 'lat_range[0] must be less than lat_range[1]')
         
         if long_range is not None:
-            if type(long_range) is not list or len(long_range) != 2:
+            if not isinstance(long_range, list) or len(long_range) != 2:
                 raise StatusException(StatusException.INVALID, 'long_range must be a list of 2 elements')
-            if type(long_range[0]) not in [int, float] or type(long_range[1]) not in [int, float]:
+            if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in long_range):
                 raise StatusException(StatusException.INVALID, 'long_range elements must be float')
             if long_range[0] < -180 or long_range[0] > 180 or long_range[1] < -180 or long_range[1] > 180:
                 raise StatusException(StatusException.INVALID, 'long_range elements must be in the range [-180, 180]')
@@ -91,49 +143,48 @@ class _ARPAVWaterLevelRetriever():
         
         if time_start is None:
             raise StatusException(StatusException.INVALID, 'Cannot process without a time valued')
-        if type(time_start) is not str:
+        if not isinstance(time_start, str):
             raise StatusException(StatusException.INVALID, 'time_start must be a string')
-        if type(time_start) is str:
-            try:
-                time_start = datetime.datetime.fromisoformat(time_start)
-            except ValueError:
-                raise StatusException(StatusException.INVALID, 'time_start must be a valid datetime iso-format string')
+        try:
+            time_start = datetime.datetime.fromisoformat(time_start)
+        except ValueError:
+            raise StatusException(StatusException.INVALID, 'time_start must be a valid datetime iso-format string')
         
         if time_end is not None:
-            if type(time_end) is not str:
+            if not isinstance(time_end, str):
                 raise StatusException(StatusException.INVALID, 'time_end must be a string')
-            if type(time_end) is str:
-                try:
-                    time_end = datetime.datetime.fromisoformat(time_end)
-                except ValueError:
-                    raise StatusException(StatusException.INVALID, 'time_end must be a valid datetime iso-format string')
+            try:
+                time_end = datetime.datetime.fromisoformat(time_end)
+            except ValueError:
+                raise StatusException(StatusException.INVALID, 'time_end must be a valid datetime iso-format string')
             if time_start > time_end:
                 raise StatusException(StatusException.INVALID, 'time_start must be less than time_end')
             
         time_start = time_start.replace(minute=(time_start.minute // 5) * 5, second=0, microsecond=0)
         time_end = time_end.replace(minute=(time_end.minute // 5) * 5, second=0, microsecond=0) if time_end is not None else time_start + datetime.timedelta(hours=1)
-        if time_end < (datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(hours=48)).replace(tzinfo=None):
+        if time_end < now - datetime.timedelta(hours=48):
             raise StatusException(StatusException.INVALID, 'Time range must be within the last 48 hours')
 
         if out_format is not None:  
-            if type(out_format) is not str:
+            if not isinstance(out_format, str):
                 raise StatusException(StatusException.INVALID, 'out_format must be a string or null')
-            if out_format not in ['geojson']:
-                raise StatusException(StatusException.INVALID, 'out_format must be one of ["geojson"]')
+            if out_format not in ['geojson', 'geojson-nl', 'geoparquet']:
+                raise StatusException(StatusException.INVALID, 'out_format must be one of ["geojson", "geojson-nl", "geoparquet"]')
         else:
             out_format = 'geojson'
         
         if bucket_destination is not None:
-            if type(bucket_destination) is not str:
+            if not isinstance(bucket_destination, str):
                 raise StatusException(StatusException.INVALID, 'bucket_destination must be a string')
             if not bucket_destination.startswith('s3://'):
                 raise StatusException(StatusException.INVALID, 'bucket_destination must start with "s3://"')
             
         if out is not None:
-            if type(out) is not str:
+            if not isinstance(out, str):
                 raise StatusException(StatusException.INVALID, 'out must be a string')
-            if not out.endswith('.geojson'):
-                raise StatusException(StatusException.INVALID, 'out must end with ".geojson"')
+            out_ext = { 'geojson': '.geojson', 'geojson-nl': '.geojsonl', 'geoparquet': '.parquet' }[out_format]
+            if not out.endswith(out_ext):
+                raise StatusException(StatusException.INVALID, f'out must end with "{out_ext}"')
             dirname, _ = os.path.split(out)
             if dirname != '' and not os.path.exists(dirname):
                 os.makedirs(dirname)
@@ -149,107 +200,203 @@ class _ARPAVWaterLevelRetriever():
         }
     
 
+    def _fetch_hour(self, hour_delta):
+        """
+        Retrieve the data records from ARPAV service for a single hour delta.
+        """
+
+        params = {
+            'rete': 'MGRAMMI',  # ???: meaning to be defined
+            'coordcd': '20005',    # ???: meaning to be defined
+            'orario': hour_delta
+        }
+        response = self._session.get(self._data_provider_service, params=params, timeout=(3, 30))
+        if response.status_code != 200:
+            message = response.content[:512].decode('utf-8', errors='replace')
+            raise StatusException(StatusException.ERROR, f'Failed to retrieve data from ARPAV service: {response.status_code} - {message}')
+        data = orjson.loads(response.content).get('data') or []
+        return data
+
+
     def retrieve_data(self, lat_range, long_range, time_start, time_end):
-        start_hour_delta = int((time_start - datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)).total_seconds() // 3600)
-        end_hour_delta = int((time_end - datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)).total_seconds() // 3600)
-
-        hour_dfs = []
-        for hour_delta in range(start_hour_delta, end_hour_delta + 1):
-            params = {
-                'rete': 'MGRAMMI',  # ???: meaning to be defined
-                'coordcd': '20005',    # ???: meaning to be defined
-                'orario': hour_delta
-            }
-            response = requests.get(self._data_provider_service, params=params)
-            if response.status_code != 200:
-                raise StatusException(StatusException.ERROR, f'Failed to retrieve data from ARPAV service: {response.status_code} - {response.text}')
-            data = response.json().get('data', [])
-            df = pd.DataFrame(data, columns=self._properties)
-            hour_dfs.append(df)
+        """
+        Retrieve the sensors data from ARPAV service as a plain DataFrame (no geometry column, see sensors_to_geodataframe).
+        """
+
+        now = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+        start_hour_delta = int((time_start - now).total_seconds() // 3600)
+        end_hour_delta = int((time_end - now).total_seconds() // 3600)
+
+        records = []
+        executor = ThreadPoolExecutor(max_workers=self._fetch_workers)
+        try:
+            for hour_records in executor.map(self._fetch_hour, range(start_hour_delta, end_hour_delta + 1)):
+                records.extend(hour_records)
+        except Exception:
+            # DOC: Fail fast, queued hours are cancelled instead of waited for
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
         
-        df = pd.concat(hour_dfs, ignore_index=True)
-        gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df['longitudine'], df['latitudine'], crs='EPSG:4326'), crs='EPSG:4326')
-        gdf.rename(columns={'dataora': 'date_time'}, inplace=True)
-        gdf['date_time'] = gdf['date_time'].apply(lambda x: datetime.datetime.fromisoformat(x) if isinstance(x, str) else x)
+        df = pd.DataFrame(records, columns=self._properties)
+        df.rename(columns={'dataora': 'date_time'}, inplace=True)
+        df['date_time'] = pd.to_datetime(df['date_time'], format='ISO8601', errors='coerce', cache=True)
+        df['longitudine'] = pd.to_numeric(df['longitudine'], errors='coerce').astype(np.float64)
+        df['latitudine'] = pd.to_numeric(df['latitudine'], errors='coerce').astype(np.float64)
+
+        # DOC: Single boolean mask for temporal + spatial filters on raw lon/lat columns, the frame is sliced only once
+        dt = df['date_time'].to_numpy()
+        mask = dt >= np.datetime64(pd.Timestamp(time_start))
+        if time_end is not None:
+            mask &= dt <= np.datetime64(pd.Timestamp(time_end))
+        if lat_range is not None:
+            y = df['latitudine'].to_numpy()
+            mask &= (y >= lat_range[0]) & (y <= lat_range[1])
+        if long_range is not None:
+            x = df['longitudine'].to_numpy()
+            mask &= (x >= long_range[0]) & (x <= long_range[1])
+        df = df.loc[mask].reset_index(drop=True)
         
         def extract_level(level):
+            if type(level) is not str or not level:
+                return np.nan
             try:
-                return json.loads(level).get('LIVELLO', np.nan)
-            except:
-                return np.nan        
-        gdf['valore'] = gdf['valore'].apply(lambda x: extract_level(x))
+                level = orjson.loads(level)
+            except orjson.JSONDecodeError:
+                return np.nan
+            level = level.get('LIVELLO') if type(level) is dict else None
+            return level if level is not None else np.nan
+        raw_levels = df['valore'].to_numpy(object)
+        df['valore'] = np.fromiter((extract_level(level) for level in raw_levels), dtype=np.float64, count=len(raw_levels))
 
-        gdf = gdf[gdf['date_time'] >= time_start]
-        if time_end is not None:
-            gdf = gdf[gdf['date_time'] <= time_end]
-        if lat_range is not None:
-            gdf = gdf[(gdf.geometry.y >= lat_range[0]) & (gdf.geometry.y <= lat_range[1])]
-        if long_range is not None:
-            gdf = gdf[(gdf.geometry.x >= long_range[0]) & (gdf.geometry.x <= long_range[1])]
+        # DOC: Plain DataFrame, point geometries are built only when a GeoDataFrame is actually returned (see sensors_to_geodataframe)
+        return df
+
+
+    def sensors_to_geodataframe(self, sensors_df):
+        """
+        Convert the sensors DataFrame to a GeoDataFrame of points built from 'longitudine' and 'latitudine'.
+        """
 
-        return gdf
+        return gpd.GeoDataFrame(sensors_df, geometry=gpd.points_from_xy(sensors_df['longitudine'], sensors_df['latitudine'], crs='EPSG:4326'), crs='EPSG:4326')
 
 
-    def data_to_feature_collection(self, sensors_gdf):
+    def _aggregate_by_station(self, sensors_df):
         """
-        Convert the sensors GeoDataFrame to a GeoJSON FeatureCollection.
+        Aggregate the sensors data by station: first value for station properties, lists for 'valore' (NaN as None) and 'date_time'.
         """
 
-        def build_metadata():
-            info_metadata = [
-                # DOC: each ealement is a { '@name': 'name', '@alias': 'alias' } ... not used beacuse the names are self-explanatory
-            ]        
-            variable_metadata = [
-                {
-                    '@name': 'water_level',
-                    '@alias': 'water_level',
-                    '@unit': 'mm',
-                    '@type': 'level'
-                }
-            ]
-            field_metadata = info_metadata + variable_metadata
-            return field_metadata
-            
-        def build_crs():
-            return {
-                "type": "name",
-                "properties": {
-                    "name": "urn:ogc:def:crs:OGC:1.3:CRS84"  # REF: https://gist.github.com/sgillies/1233327 lines 256:271
-                }
-            }
+        # DOC: Sort once by station and split 'valore' / 'date_time' in contiguous per-station slices, avoids the groupby-agg overhead of building lists
+        sensors_df = sensors_df[sensors_df['codice_stazione'].notna()].sort_values(by=['codice_stazione', 'date_time'])
+        codes = sensors_df['codice_stazione'].to_numpy()
+        _, first_idx = np.unique(codes, return_index=True)
+        bounds = np.append(first_idx, len(codes))
+        station_slices = [ slice(start, end) for start, end in zip(bounds[:-1], bounds[1:]) ]
+
+        station_props = [ prop for prop in self._properties if prop in sensors_df.columns and prop not in ['codice_stazione', 'valore', 'date_time'] ]
+        # DOC: Station properties keep the first non-null value per station
+        df_agg = sensors_df.groupby(by='codice_stazione', sort=True)[station_props].first().reset_index()
+
+        date_times = sensors_df['date_time'].to_numpy(object)
+        values = sensors_df['valore'].to_numpy(np.float64)
+        values = np.where(np.isnan(values), None, values)
+        df_agg['date_time'] = [ date_times[s].tolist() for s in station_slices ]
+        df_agg['valore'] = [ values[s].tolist() for s in station_slices ]
+
+        return df_agg
+
+
+    def _iter_features(self, sensors_df):
+        """
+        Yield one GeoJSON Feature per station of the sensors DataFrame.
+        """
 
-        gdf_agg = sensors_gdf.groupby(by='codice_stazione').aggregate({ prop: 'first' for prop in self._properties if prop in sensors_gdf.columns } | { 'valore': list, 'date_time': list }).reset_index(drop=True)
+        # DOC: ISO strings are formatted once on the whole column, not per point
+        sensors_df = sensors_df.assign(date_time=sensors_df['date_time'].dt.strftime('%Y-%m-%dT%H:%M:%S'))
+        gdf_agg = self._aggregate_by_station(sensors_df)
         
-        features = []
-        for _, row in gdf_agg.iterrows():
-            geometry = {
-                'type': 'Point',
-                'coordinates': [row['longitudine'], row['latitudine']]
-            }
-            properties = { prop: row[prop] for prop in self._properties if prop not in ['longitudine', 'latitudine', 'dataora', 'date_time', 'valore'] }
-            properties['water_level'] = [ 
-                [ dt.isoformat(), val if not np.isnan(val) else None ]
-                for dt, val in zip(row['date_time'], row['valore']) 
-            ]
-            
-            features.append({
+        # DOC: Columns are extracted once as plain lists, features are assembled without per-row Series
+        props_cols = { prop: gdf_agg[prop].tolist() for prop in self._properties if prop in gdf_agg.columns and prop not in ['longitudine', 'latitudine', 'dataora', 'date_time', 'valore'] }
+        lons = gdf_agg['longitudine'].tolist()
+        lats = gdf_agg['latitudine'].tolist()
+        dts = gdf_agg['date_time'].tolist()
+        vals = gdf_agg['valore'].tolist()
+
+        for i, (lon, lat, dt_list, val_list) in enumerate(zip(lons, lats, dts, vals)):
+            yield {
                 'type': 'Feature',
-                'geometry': geometry,
-                'properties': properties
-            })
-        
+                'geometry': {
+                    'type': 'Point',
+                    'coordinates': [lon, lat]
+                },
+                'properties': {
+                    ** { prop: values[i] for prop, values in props_cols.items() },
+                    'water_level': [ [ dt, val ] for dt, val in zip(dt_list, val_list) ]
+                }
+            }
+
+
+    def data_to_feature_collection(self, sensors_df):
+        """
+        Convert the sensors DataFrame to a GeoJSON FeatureCollection.
+        """
+
         feature_collection = {
             'type': 'FeatureCollection',
-            'features': features,
+            'features': list(self._iter_features(sensors_df)),
             'metadata': {
-                'field': build_metadata(),
+                'field': _FIELD_METADATA,
             },
-            'crs': build_crs()
+            'crs': _CRS
         }
 
         return feature_collection
     
 
+    def data_to_feature_collection_file(self, sensors_df, filepath, newline_delimited=False):
+        """
+        Stream the sensors DataFrame to a GeoJSON FeatureCollection file (or newline-delimited GeoJSON), one feature at a time.
+        """
+
+        with open(filepath, 'wb') as f:
+            if newline_delimited:
+                for feature in self._iter_features(sensors_df):
+                    f.write(orjson.dumps(feature, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+            else:
+                f.write(b'{"type":"FeatureCollection","features":[')
+                for i, feature in enumerate(self._iter_features(sensors_df)):
+                    if i > 0:
+                        f.write(b',\n')
+                    f.write(orjson.dumps(feature, option=orjson.OPT_SERIALIZE_NUMPY))
+                f.write(b'],"metadata":')
+                f.write(orjson.dumps({ 'field': _FIELD_METADATA }))
+                f.write(b',"crs":')
+                f.write(orjson.dumps(_CRS))
+                f.write(b'}')
+
+        return filepath
+
+
+    def data_to_geoparquet(self, sensors_df, filepath):
+        """
+        Save the sensors DataFrame as GeoParquet, one row per station with the time series as a list<struct> column.
+        """
+
+        gdf_agg = self._aggregate_by_station(sensors_df)
+        gdf_agg['water_level'] = [
+            [ { 'date_time': dt, 'water_level': val } for dt, val in zip(dt_list, val_list) ]
+            for dt_list, val_list in zip(gdf_agg['date_time'].tolist(), gdf_agg['valore'].tolist())
+        ]
+        gdf_agg = gdf_agg.drop(columns=['date_time', 'valore'])
+
+        stations_gdf = self.sensors_to_geodataframe(gdf_agg)
+        # DOC: geoarrow encoding does not support empty GeoDataFrames (no readings in time window / bbox), fall back to WKB
+        geometry_encoding = 'geoarrow' if not stations_gdf.empty else 'WKB'
+        stations_gdf.to_parquet(filepath, geometry_encoding=geometry_encoding, compression='zstd', schema_version='1.1.0')
+
+        return filepath
+
+
     def run(
         self,
         lat_range = None,
@@ -258,11 +405,13 @@ class _ARPAVWaterLevelRetriever():
         out_format = None,
         bucket_destination = None,
         out = None,
+        as_geodataframe = True,
         **kwargs
     ):
         
         """
         Run the ARPAV Retriever.
+        If neither out nor bucket_destination are provided, the sensors data are returned as a GeoDataFrame (plain DataFrame if as_geodataframe is False).
         """
 
         try:
@@ -286,35 +435,36 @@ class _ARPAVWaterLevelRetriever():
             Logger.debug(f"Running ARPAV Retriever with parameters: {validated_args}")
 
             # DOC: Retrieve data from ARPAV API
-            sensors_gdf = self.retrieve_data(
+            sensors_df = self.retrieve_data(
                 long_range=long_range,
                 lat_range=lat_range,
                 time_start=time_start,
                 time_end=time_end
             )
-            Logger.debug(f"Retrieved {len(sensors_gdf)} sensors data from ARPAV API")
+            Logger.debug(f"Retrieved {len(sensors_df)} sensors data from ARPAV API")
 
-            # DOC: Build feature collection
-            if out_format == 'geojson':
-                feature_collection = self.data_to_feature_collection(sensors_gdf)
-                feature_collection_fn = filesystem.normpath(f'{self.name}__{time_start.isoformat()}__{time_end.isoformat() if time_end else datetime.datetime.now(tz=datetime.timezone.utc).isoformat()}.geojson')
+            # DOC: Build output file
+            output_fn = f'{self.name}__{time_start.isoformat()}__{time_end.isoformat() if time_end else datetime.datetime.now(tz=datetime.timezone.utc).isoformat()}'
+            if out_format in ['geojson', 'geojson-nl']:
+                feature_collection_fn = filesystem.normpath(f'{output_fn}.geojson' if out_format == 'geojson' else f'{output_fn}.geojsonl')
                 feature_collection_fp = os.path.join(self._tmp_data_folder, feature_collection_fn) if out is None else out
-                with open(feature_collection_fp, 'w') as f:
-                    json.dump(feature_collection, f)
+                self.data_to_feature_collection_file(sensors_df, feature_collection_fp, newline_delimited=out_format == 'geojson-nl')
                 output_filespaths = [feature_collection_fp]
                 Logger.debug(f"Feature collection saved to {feature_collection_fp}")
+            elif out_format == 'geoparquet':
+                geoparquet_fn = filesystem.normpath(f'{output_fn}.parquet')
+                geoparquet_fp = os.path.join(self._tmp_data_folder, geoparquet_fn) if out is None else out
+                self.data_to_geoparquet(sensors_df, geoparquet_fp)
+                output_filespaths = [geoparquet_fp]
+                Logger.debug(f"GeoParquet saved to {geoparquet_fp}")
 
             # DOC: Store data in bucket if bucket_destination is provided
             if bucket_destination is not None:
-                bucket_uris = []
-                for output_filepath in output_filespaths:
-                    output_filename = os.path.basename(output_filepath)
-                    bucket_uri = f'{bucket_destination}/{output_filename}'
-                    upload_status = module_s3.s3_upload(output_filepath, bucket_uri)
-                    if not upload_status:
-                        raise StatusException(StatusException.ERROR, f"Failed to upload data to bucket {bucket_destination}")
-                    bucket_uris.append(bucket_uri)
-                    Logger.debug(f"Data stored in bucket: {bucket_uri}")
+                bucket_uris = [ f'{bucket_destination}/{os.path.basename(output_filepath)}' for output_filepath in output_filespaths ]
+                upload_statuses = module_s3.s3_upload_files(output_filespaths, bucket_uris)
+                if not all(upload_statuses):
+                    raise StatusException(StatusException.ERROR, f"Failed to upload data to bucket {bucket_destination}")
+                Logger.debug(f"Data stored in bucket: {bucket_uris}")
 
             # DOC: Prepare outputs
             if bucket_destination is not None or out is not None:
@@ -330,7 +480,7 @@ class _ARPAVWaterLevelRetriever():
                         ** ( {'filepath': output_filespaths[0]} if len(output_filespaths) == 1 else {'filepaths': output_filespaths} )
                     }
             else:
-                outputs = sensors_gdf
+                outputs = self.sensors_to_geodataframe(sensors_df) if as_geodataframe else sensors_df
                 
             Logger.debug(f"Outputs prepared")
 
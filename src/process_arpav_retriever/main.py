@@ -67,7 +67,7 @@ class _ARG_NAMES():
     }
     OUT_FORMAT = {
         'aliases': ['--out_format', '--output_format', '--of'],
-        'help': "Output format of the retrieved data.",
+        'help': "Output format of the retrieved data, one of 'geojson', 'geojson-nl' (newline-delimited GeoJSON) or 'geoparquet'.",
         'default': None,
         'example': '--out_format geojson',
     }
@@ -116,7 +116,7 @@ class _ARG_NAMES():
 )
 @click.option(
     *_ARG_NAMES.OUT_FORMAT['aliases'],
-    type=click.Choice(['geojson'], case_sensitive=False), default=_ARG_NAMES.OUT_FORMAT['default'], 
+    type=click.Choice(['geojson', 'geojson-nl', 'geoparquet'], case_sensitive=False), default=_ARG_NAMES.OUT_FORMAT['default'], 
     help=_ARG_NAMES.OUT_FORMAT['help'],
 )
 @click.option(
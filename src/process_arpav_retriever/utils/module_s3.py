@@ -28,8 +28,10 @@ import shutil
 import tempfile
 import fnmatch
 import boto3
+from boto3.s3.transfer import TransferConfig
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from requests.exceptions import RequestException
 from botocore.exceptions import ClientError, NoCredentialsError
 from .filesystem import justext, justpath, justfname, forceext
@@ -41,6 +43,9 @@ logging.getLogger("boto3").setLevel(logging.CRITICAL)
 
 shpext = ("shp", "dbf", "shx", "prj", "qml", "qix", "qlr", "mta", "qmd", "cpg")
 
+_MB = 1024 * 1024
+_S3_TRANSFER_CONFIG = TransferConfig(multipart_threshold=128 * _MB, multipart_chunksize=128 * _MB, max_concurrency=8)
+
 def tmp(filename):
     """
     tmp - return the temporary directory
@@ -175,7 +180,7 @@ def get_client(client=None):
 
 def s3_upload(filename, uri, remove_src=False, client=None):
     """
-    Upload a file to an S3 bucket
+    Upload a file to an S3 bucket, large files are uploaded as parallel multipart chunks
     Examples: s3_upload(filename, "s3://saferplaces.co/a/rimini/lidar_rimini_building_2.tif")
     """
 
@@ -188,7 +193,8 @@ def s3_upload(filename, uri, remove_src=False, client=None):
 
             client.upload_file(Filename=filename,
                                 Bucket=bucket_name, Key=key,
-                                ExtraArgs=extra_args)
+                                ExtraArgs=extra_args,
+                                Config=_S3_TRANSFER_CONFIG)
      
             if remove_src:
                 Logger.debug("removing %s", filename)
@@ -203,6 +209,20 @@ def s3_upload(filename, uri, remove_src=False, client=None):
     return False
 
 
+def s3_upload_files(filenames, uris, remove_src=False, client=None, max_workers=8):
+    """
+    Upload many files to S3 concurrently, sharing a single client
+    Examples: s3_upload_files([f1, f2], ["s3://saferplaces.co/a/f1.tif", "s3://saferplaces.co/a/f2.tif"])
+    """
+    if not filenames:
+        return []
+    client = get_client(client)
+    if len(filenames) == 1:
+        return [s3_upload(filenames[0], uris[0], remove_src=remove_src, client=client)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(filenames))) as executor:
+        return list(executor.map(lambda filename, uri: s3_upload(filename, uri, remove_src=remove_src, client=client), filenames, uris))
+
+
 def s3_download(uri, fileout=None, remove_src=False, client=None):
     """
     Download a file from an S3 bucket